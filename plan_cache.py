@@ -0,0 +1,183 @@
+# agents/plan_cache.py
+import copy
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+_CACHE_FILE = re.compile(r"^[0-9a-f]{64}\.json$")
+
+class PlanCache:
+    def __init__(self, max_entries=256, persist_dir=None, max_disk_entries=1024, max_disk_age=86400):
+        """
+        Content-addressed store for generated farm plans.
+        Keeps the most recently used plans in memory (LRU) and, when
+        persist_dir is given, also writes them to disk as JSON files.
+        Keys are hashable tuples; cached plans are shared between callers
+        and must be treated as read-only.
+        The disk tier is pruned only occasionally: when the running file
+        count passes max_disk_entries, or max_disk_age seconds after the
+        last prune. Pruning removes files older than max_disk_age and keeps
+        the 90% of max_disk_entries most recently used (disk hits refresh
+        a file's mtime), so scans stay rare.
+        """
+        self.max_entries = max_entries
+        self.persist_dir = persist_dir
+        self.max_disk_entries = max_disk_entries
+        self.max_disk_age = max_disk_age
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()  # instance is shared across sessions
+        self.hits = 0
+        self.misses = 0
+        self._disk_count = 0
+        self._last_prune = time.time()
+        self._pruning = False
+
+        if self.persist_dir:
+            os.makedirs(self.persist_dir, exist_ok=True)
+            self._disk_count = self._prune_disk()
+
+    def get(self, key):
+        """Return the cached plan, or None if not present"""
+        with self._lock:
+            plan = self._entries.get(key)
+            if plan is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return plan
+
+        plan = self._load(key)
+        with self._lock:
+            if plan is None:
+                self.misses += 1
+                return None
+            self._remember(key, plan)
+            self.hits += 1
+        return plan
+
+    def set(self, key, plan):
+        """Store a plan in memory and, if enabled, on disk"""
+        plan = copy.deepcopy(plan)  # detach from caller-owned inputs
+        with self._lock:
+            self._remember(key, plan)
+        if not self._save(key, plan):
+            return
+
+        with self._lock:
+            self._disk_count += 1  # overwrites overcount, which only prunes sooner
+            due = (self._disk_count > self.max_disk_entries
+                   or time.time() - self._last_prune > self.max_disk_age)
+            if not due or self._pruning:
+                return
+            self._pruning = True  # one session prunes, the rest carry on
+            counted = self._disk_count
+
+        remaining = 0
+        try:
+            remaining = self._prune_disk()
+        finally:
+            with self._lock:
+                # Keep writes made by other sessions while the scan ran
+                self._disk_count = remaining + self._disk_count - counted
+                self._last_prune = time.time()
+                self._pruning = False
+
+    def clear(self, disk=False):
+        """Drop all in-memory entries, and the persisted files if disk=True"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+        if disk and self.persist_dir:
+            for name in os.listdir(self.persist_dir):
+                if _CACHE_FILE.match(name):
+                    self._remove(os.path.join(self.persist_dir, name))
+            with self._lock:
+                self._disk_count = 0
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def _remember(self, key, plan):
+        """Insert and evict; caller must hold self._lock"""
+        self._entries[key] = plan
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _path(self, key):
+        # Hashing is only paid on the disk tier, never on memory hits
+        digest = hashlib.sha256(repr(key).encode("utf-8")).hexdigest()
+        return os.path.join(self.persist_dir, f"{digest}.json")
+
+    def _load(self, key):
+        if not self.persist_dir:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                plan = json.load(f)
+            os.utime(path)  # mark as recently used for _prune_disk
+            return plan
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"Plan cache read error: {e}")
+            return None
+
+    def _save(self, key, plan):
+        """Write a plan to disk; returns True if a file was written"""
+        if not self.persist_dir:
+            return False
+        tmp_path = None
+        try:
+            # Unique temp file so concurrent writers never share one
+            with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=self.persist_dir,
+                                             suffix=".tmp", delete=False) as f:
+                tmp_path = f.name
+                json.dump(plan, f)
+            os.replace(tmp_path, self._path(key))
+            return True
+        except Exception as e:
+            print(f"Plan cache write error: {e}")
+            if tmp_path and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return False
+
+    def _prune_disk(self):
+        """Remove expired plan files and cap how many are kept; returns the count left"""
+        now = time.time()
+        files = []
+        for name in os.listdir(self.persist_dir):
+            path = os.path.join(self.persist_dir, name)
+            try:
+                mtime = os.path.getmtime(path)
+            except OSError:
+                continue
+            if _CACHE_FILE.match(name):
+                files.append((mtime, path))
+            elif name.endswith(".tmp") and now - mtime > self.max_disk_age:
+                self._remove(path)  # left behind by an interrupted write
+
+        keep = self.max_disk_entries * 9 // 10
+        files.sort(reverse=True)
+        remaining = 0
+        for mtime, path in files:
+            if remaining >= keep or now - mtime > self.max_disk_age:
+                self._remove(path)
+            else:
+                remaining += 1
+        return remaining
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"Plan cache cleanup error: {e}")
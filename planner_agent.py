@@ -1,9 +1,37 @@
 # agents/planner_agent.py
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
+import hashlib
+import inspect
 import random
 
+# Manual version for changes outside the class (e.g. cache key semantics);
+# edits to the rules themselves are picked up by _rules_version below
+PLANNER_VERSION = "1"
+
+_RULES_VERSIONS = {}
+
+def _rules_version(cls):
+    """
+    Identify a planner class and its rule code, memoized per class.
+    Hashes the source of every PlannerAgent class in the MRO, so editing
+    any rule (or overriding one in a subclass) changes the cache keys.
+    """
+    version = _RULES_VERSIONS.get(cls)
+    if version is None:
+        digest = hashlib.sha256()
+        try:
+            for klass in cls.__mro__:
+                if issubclass(klass, PlannerAgent):
+                    digest.update(inspect.getsource(klass).encode("utf-8"))
+            rules_hash = digest.hexdigest()
+        except (OSError, TypeError):
+            rules_hash = PLANNER_VERSION  # source unavailable, e.g. .pyc-only deploy
+        version = (cls.__module__, cls.__qualname__, rules_hash)
+        _RULES_VERSIONS[cls] = version
+    return version
+
 class PlannerAgent:
-    def __init__(self, yield_multiplier=1.2, risk_threshold=0.3):
+    def __init__(self, yield_multiplier=1.2, risk_threshold=0.3, cache=None):
         self.base_yield = {
             "wheat": 2000,  # kg/acre
             "rice": 2500,
@@ -13,6 +41,9 @@ class PlannerAgent:
         }
         self.yield_multiplier = yield_multiplier
         self.risk_threshold = risk_threshold
+        self.heat_stress_temp = 35  # degC
+        self.high_price = 5000  # per quintal
+        self.cache = cache  # optional PlanCache
 
     def plan(self, farmer_input, weather_data, soil_report, expert_advice, market_data):
         """
@@ -28,6 +59,7 @@ class PlannerAgent:
                 "risk_assessment": dict,
                 "expected_yield": str
             }
+        With a cache, hits return the shared cached plan: treat it as read-only.
         """
         # Validate inputs
         farmer_input = farmer_input or {}
@@ -36,6 +68,82 @@ class PlannerAgent:
         expert_advice = expert_advice or []
         market_data = market_data or {}
 
+        if self.cache is None:
+            return self._build_plan(farmer_input, weather_data, soil_report, expert_advice, market_data)
+
+        try:
+            key = self.cache_key(farmer_input, weather_data, soil_report, expert_advice, market_data)
+            hash(key)
+        except TypeError:
+            # Inputs that cannot be keyed exactly are planned without the cache
+            return self._build_plan(farmer_input, weather_data, soil_report, expert_advice, market_data)
+
+        plan = self.cache.get(key)
+        if plan is None:
+            plan = self._build_plan(farmer_input, weather_data, soil_report, expert_advice, market_data)
+            self.cache.set(key, plan)
+        return plan
+
+    def cache_key(self, farmer_input, weather_data, soil_report, expert_advice, market_data):
+        """
+        Build a plan cache key from only the inputs the planner reads.
+        Weather, pH and market prices are reduced to the bands the rules
+        compare against, so requests that would yield the same plan share
+        an entry. The key includes the rules version and a hash of the
+        rule code, the agent settings and today's date (planting dates
+        are relative to today).
+        """
+        nutrients = soil_report.get('nutrients', {})
+        demand = market_data.get('demand', {}) or {}
+        prices = market_data.get('prices') or [{}]
+
+        # A flat tuple is much cheaper to build and hash than the plan itself
+        return (
+            PLANNER_VERSION, _rules_version(type(self)),
+            self._freeze(self.base_yield), self.yield_multiplier, self.risk_threshold,
+            date.today(),
+            farmer_input.get('preferred_crop'),
+            self._freeze(farmer_input.get('recommended_crops', [])),
+            str(farmer_input.get('budget', 'medium')).lower(),
+            farmer_input.get('area', 1),
+            weather_data.get('rainfall', 'moderate'),
+            self._band(weather_data.get('temperature', 0), self.heat_stress_temp),
+            nutrients.get('N', 0), nutrients.get('P', 0), nutrients.get('K', 0),
+            self._ph_band(soil_report.get('ph', 7)),
+            soil_report.get('moisture'),
+            self._freeze(expert_advice),  # returned as-is, so key on the value
+            demand.get('top_crop'),
+            demand.get('trend', 'stable'),
+            self._band(prices[0].get('modal_price', 0), self.high_price),
+        )
+
+    def _freeze(self, value):
+        """
+        Shallow, type-tagged snapshot of a container for use in a key.
+        Nested unhashable values make the key unhashable, so such inputs
+        simply bypass the cache.
+        """
+        if isinstance(value, dict):
+            return (type(value), tuple(value.items()))
+        if isinstance(value, (list, tuple)):
+            return (type(value), tuple(value))
+        return value
+
+    def _band(self, value, threshold):
+        """Quantize a reading to which side of a rule threshold it falls"""
+        try:
+            return "above" if value > threshold else "at_or_below"
+        except TypeError:
+            return repr(value)
+
+    def _ph_band(self, ph):
+        try:
+            return "acidic" if ph < 6 else "alkaline" if ph > 7.5 else "neutral"
+        except TypeError:
+            return repr(ph)
+
+    def _build_plan(self, farmer_input, weather_data, soil_report, expert_advice, market_data):
+        """Run the planning rules on validated inputs"""
         # Core planning logic
         plan = {
             "suggested_crop": self._determine_crop(farmer_input, market_data),
@@ -133,7 +241,7 @@ class PlannerAgent:
         elif trend == 'decreasing':
             advice.append("Recommend immediate sale after harvest")
             
-        if price > 5000:
+        if price > self.high_price:
             advice.append("High current prices - good time to sell")
         return " ".join(advice) or "Market conditions stable"
 
@@ -148,7 +256,7 @@ class PlannerAgent:
                 "mitigation": "Ensure proper drainage systems"
             }
             
-        if weather_data.get('temperature', 0) > 35:
+        if weather_data.get('temperature', 0) > self.heat_stress_temp:
             risks['heat_stress'] = {
                 "probability": 0.6,
                 "mitigation": "Install shade nets and increase irrigation"
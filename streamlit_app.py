@@ -1,3 +1,4 @@
+import os
 import streamlit as st
 import pandas as pd
 from datetime import datetime
@@ -7,11 +8,17 @@ from agents.soil_agent import SoilAgent
 from agents.expert_agent import ExpertAgent
 from agents.market_agent import MarketAgent
 from agents.planner_agent import PlannerAgent
+from agents.plan_cache import PlanCache
 
 st.set_page_config(page_title="Smart Farming Assistant", page_icon="🌾", layout="centered")
 st.title("🌱 Smart Farming Recommendation System")
 st.markdown("Get personalized crop and farming recommendations based on your land, weather, soil, and market conditions.")
 
+@st.cache_resource
+def get_plan_cache():
+    # Shared across sessions; set PLAN_CACHE_DIR to also keep plans on disk
+    return PlanCache(persist_dir=os.getenv("PLAN_CACHE_DIR"))
+
 # Sidebar Weather Input
 st.sidebar.header("🌤 Current Weather")
 location_weather = st.sidebar.text_input("Check weather for location:", "Karnataka")
@@ -178,7 +185,7 @@ with st.spinner("✨ Generating final plan..."):
         # Include recommended crops in input for planner
         farmer_input['recommended_crops'] = recommended_crops
         
-        planner = PlannerAgent()
+        planner = PlannerAgent(cache=get_plan_cache())
         recommendation = planner.plan(
             farmer_input, 
             forecast, 
@@ -0,0 +1,102 @@
+import os
+import tempfile
+import unittest
+
+from agents.plan_cache import PlanCache
+from agents.planner_agent import PlannerAgent
+
+FARMER = {"area": 2.0, "budget": "low", "preferred_crop": None, "recommended_crops": ["millet", "bajra"]}
+WEATHER = {"temperature": 30, "rainfall": "low"}
+SOIL = {"ph": 6.5, "moisture": "low", "nutrients": {"N": 0.5, "P": 0.7, "K": 0.6}}
+ADVICE = ["Use organic fertilizer", "Plant in early June"]
+MARKET = {"prices": [{"modal_price": 2200}], "demand": {"top_crop": "millet", "trend": "stable"}}
+
+
+def plan_inputs(weather=None, soil=None, price=None):
+    market = dict(MARKET, prices=[{"modal_price": price}]) if price is not None else MARKET
+    return (FARMER, dict(WEATHER, **(weather or {})), dict(SOIL, **(soil or {})), ADVICE, market)
+
+
+class PlanCacheTest(unittest.TestCase):
+    def test_lru_evicts_least_recently_used(self):
+        cache = PlanCache(max_entries=2)
+        cache.set("a", {"n": 1})
+        cache.set("b", {"n": 2})
+        cache.get("a")  # "b" is now the least recently used
+        cache.set("c", {"n": 3})
+
+        self.assertEqual(cache.get("a"), {"n": 1})
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("c"), {"n": 3})
+        self.assertEqual(len(cache), 2)
+
+    def test_disk_round_trip_after_memory_eviction(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = PlanCache(max_entries=1, persist_dir=tmp)
+            plan = PlannerAgent().plan(*plan_inputs())
+            cache.set(("k", 1), plan)
+            cache.set(("k", 2), {"other": True})  # evicts ("k", 1) from memory
+
+            self.assertEqual(cache.get(("k", 1)), plan)
+            self.assertEqual(cache.hits, 1)
+            self.assertEqual(PlanCache(persist_dir=tmp).get(("k", 1)), plan)
+
+    def test_clear_disk(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = PlanCache(persist_dir=tmp)
+            cache.set(("k", 1), {"n": 1})
+            cache.clear(disk=True)
+            self.assertEqual(os.listdir(tmp), [])
+            self.assertIsNone(cache.get(("k", 1)))
+
+
+class PlannerCacheTest(unittest.TestCase):
+    def assert_cached_matches(self, first, second, shared):
+        """Plan both inputs through one cache and compare with uncached plans"""
+        cache = PlanCache()
+        planner = PlannerAgent(cache=cache)
+        for inputs in (first, second):
+            self.assertEqual(planner.plan(*inputs), PlannerAgent().plan(*inputs))
+        self.assertEqual(cache.hits, 1 if shared else 0)
+
+    def test_quantized_inputs_share_an_entry(self):
+        self.assert_cached_matches(plan_inputs({"temperature": 30}), plan_inputs({"temperature": 31}), True)
+        self.assert_cached_matches(plan_inputs(soil={"ph": 6.5}), plan_inputs(soil={"ph": 6.8}), True)
+        self.assert_cached_matches(plan_inputs(price=2200), plan_inputs(price=4000), True)
+
+    def test_temperature_threshold_edge(self):
+        self.assert_cached_matches(plan_inputs({"temperature": 34}), plan_inputs({"temperature": 35}), True)
+        self.assert_cached_matches(plan_inputs({"temperature": 35}), plan_inputs({"temperature": 35.1}), False)
+
+    def test_ph_threshold_edges(self):
+        self.assert_cached_matches(plan_inputs(soil={"ph": 6}), plan_inputs(soil={"ph": 7}), True)
+        self.assert_cached_matches(plan_inputs(soil={"ph": 5.9}), plan_inputs(soil={"ph": 6}), False)
+        self.assert_cached_matches(plan_inputs(soil={"ph": 7.5}), plan_inputs(soil={"ph": 7}), True)
+        self.assert_cached_matches(plan_inputs(soil={"ph": 7.5}), plan_inputs(soil={"ph": 7.6}), False)
+
+    def test_price_threshold_edge(self):
+        self.assert_cached_matches(plan_inputs(price=4999), plan_inputs(price=5000), True)
+        self.assert_cached_matches(plan_inputs(price=5000), plan_inputs(price=5001), False)
+
+    def test_distinct_expert_advice_is_not_shared(self):
+        cache = PlanCache()
+        planner = PlannerAgent(cache=cache)
+        inputs = list(plan_inputs())
+        inputs[3] = {"tip": 1}
+        self.assertEqual(planner.plan(*inputs)["expert_tips"], {"tip": 1})
+        inputs[3] = {"tip": 2}
+        self.assertEqual(planner.plan(*inputs)["expert_tips"], {"tip": 2})
+
+    def test_subclass_rules_are_not_shared(self):
+        class FlatBudgetPlanner(PlannerAgent):
+            def _create_budget_plan(self, budget_level):
+                return {"fertilizer": "None"}
+
+        cache = PlanCache()
+        PlannerAgent(cache=cache).plan(*plan_inputs())
+        plan = FlatBudgetPlanner(cache=cache).plan(*plan_inputs())
+        self.assertEqual(plan["budget_plan"], {"fertilizer": "None"})
+
+
+if __name__ == "__main__":
+    unittest.main()